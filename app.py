@@ -1,11 +1,21 @@
 import streamlit as st
 from dotenv import load_dotenv
 import os
-import google.generativeai as genai
-from youtube_transcript_api import YouTubeTranscriptApi
+import sqlite3
+import csv
+import json
+import hashlib
+import asyncio
+import threading
+import logging
+import random
+from youtube_transcript_api import YouTubeTranscriptApi, NoTranscriptFound
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import pandas as pd
+import requests
+from diskcache import Cache
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 # Page configuration
 st.set_page_config(
@@ -17,27 +27,74 @@ st.set_page_config(
 # Load environment variables and configure
 
 load_dotenv()
-GOOGLE_API_KEY =st.secrets['secret_key']
-genai.configure(api_key= GOOGLE_API_KEY) #Put your Google api Key here
+GOOGLE_API_KEY =st.secrets['secret_key'] #Put your Google api Key here
 
+# Heavy SDKs are imported on first use so the page renders before they load
+@st.cache_resource
+def _get_genai():
+    import google.generativeai as genai
+    genai.configure(api_key=GOOGLE_API_KEY)
+    return genai
+
+logger = logging.getLogger(__name__)
+
+_VIDEO_ID_RE = re.compile(r'(?:youtu\.be/|v=|/embed/|/shorts/|/live/|/v/)([0-9A-Za-z_-]{11})')
 
-@st.cache_data(ttl=3600)
 def extract_video_id(youtube_url):
-    try:
-        if 'youtu.be' in youtube_url:
-            return youtube_url.split('/')[-1].split('?')[0]
-        video_id_match = re.search(r'(?:v=|\/)([0-9A-Za-z_-]{11}).*', youtube_url)
-        return video_id_match.group(1) if video_id_match else None
-    except Exception as e:
-        st.error(f"Error extracting video ID: {str(e)}")
-        return None
+    video_id_match = _VIDEO_ID_RE.search(youtube_url)
+    return video_id_match.group(1) if video_id_match else None
+
+_TRANSCRIPT_CACHE_TTL = 7 * 24 * 3600
+
+@st.cache_resource
+def _disk_cache():
+    # Persists transcripts and summaries across process restarts
+    return Cache('.summarizer_cache')
+
+@st.cache_resource
+def _http_session():
+    # Shared keep-alive session so repeated fetches reuse the TCP/TLS connection
+    session = requests.Session()
+    session.headers['User-Agent'] = "Mozilla/5.0 (compatible; YouTubeSummarizerPro)"
+    return session
+
+@st.cache_resource
+def _transcript_api():
+    return YouTubeTranscriptApi(http_client=_http_session())
+
+@st.cache_resource
+def _ydl():
+    # YoutubeDL isn't thread-safe, so callers hold the lock around extract_info
+    import yt_dlp
+    return yt_dlp.YoutubeDL({'quiet': True, 'skip_download': True}), threading.Lock()
+
+def _fetch_oembed_metadata(video_id):
+    # Title and channel come back in one small JSON response, no page scraping needed
+    response = _http_session().get(
+        "https://www.youtube.com/oembed",
+        params={'url': f"https://youtu.be/{video_id}", 'format': 'json'},
+        timeout=3
+    )
+    response.raise_for_status()
+    result = response.json()
+    return {
+        'title': result.get('title', 'Unknown'),
+        'channel': result.get('author_name', 'Unknown'),
+        'duration': None,
+        'views': None
+    }
 
 @st.cache_data(ttl=3600)
-def extract_video_metadata(video_id):
+def extract_video_metadata(video_id, full_stats=False):
+    if not full_stats:
+        try:
+            return _fetch_oembed_metadata(video_id)
+        except Exception:
+            pass  # Fall back to yt_dlp below
     try:
-        import yt_dlp
-        ydl = yt_dlp.YoutubeDL({'quiet': True})
-        result = ydl.extract_info(f"https://www.youtube.com/watch?v={video_id}", download=False)
+        ydl, lock = _ydl()
+        with lock:
+            result = ydl.extract_info(f"https://www.youtube.com/watch?v={video_id}", download=False)
         return {
             'title': result.get('title', 'Unknown'),
             'channel': result.get('uploader', 'Unknown'),
@@ -53,60 +110,367 @@ def extract_transcript_details(youtube_video_url):
     try:
         video_id = extract_video_id(youtube_video_url)
         if not video_id:
-            return None, None
-        
-        transcript_data = YouTubeTranscriptApi.get_transcript(video_id)
+            return None, None, None
+
+        # Plain caption lists are persisted rather than the frame, so entries survive pandas upgrades
+        disk_cache = _disk_cache()
+        cache_key = ('captions', video_id)
+        cached = disk_cache.get(cache_key)
+        if cached is not None:
+            starts, texts = cached
+        else:
+            transcript_list = _transcript_api().list(video_id)
+            try:
+                transcript = transcript_list.find_transcript(['en'])
+            except NoTranscriptFound:
+                # Fall back to whatever transcript the video has, manual or auto-generated
+                transcript = next(iter(transcript_list))
+            transcript_data = transcript.fetch().to_raw_data()
+            if not transcript_data:
+                return None, None, None
+
+            # Single pass over the captions; builds column lists instead of inferring a frame from dicts
+            starts, texts = [], []
+            for item in transcript_data:
+                starts.append(item['start'])
+                texts.append(item['text'])
+            disk_cache.set(cache_key, (starts, texts), expire=_TRANSCRIPT_CACHE_TTL)
+        full_transcript = " ".join(texts)
         
-        formatted_transcript = []
-        for item in transcript_data:
-            start_time = int(item['start'])
-            text = item['text']
-            timestamp = f"{start_time // 60:02d}:{start_time % 60:02d}"
-            formatted_transcript.append({'timestamp': timestamp, 'text': text})
+        # Build all mm:ss timestamps at once with vectorized ops instead of a per-caption loop
+        import pandas as pd
+        df = pd.DataFrame({'start': pd.Series(starts, dtype='float64'), 'text': pd.Series(texts, dtype=str)})
+        minutes, seconds = divmod(df['start'].astype('int64'), 60)
+        df['timestamp'] = minutes.astype(str).str.zfill(2).str.cat(seconds.astype(str).str.zfill(2), sep=':')
         
-        full_transcript = " ".join(item["text"] for item in transcript_data)
-        return full_transcript, formatted_transcript
+        # Returned as-is so the viewer doesn't rebuild a frame from a list of dicts
+        transcript_df = df[['timestamp', 'text']]
+        # Cached alongside the rest so reruns don't rebuild the download text
+        transcript_download = "\n".join(df['timestamp'].str.cat(df['text'], sep=': ').values)
+        return full_transcript, transcript_df, transcript_download
     
     except Exception as e:
         st.error(f"Error extracting transcript: {str(e)}")
-        return None, None
+        return None, None, None
 
-def generate_gemini_content(transcript_text, prompt_template, summary_type="detailed"):
-    try:
-        model = genai.GenerativeModel("gemini-1.5-flash")
-        
-        if summary_type == "quick":
-            prompt = f"""Provide a concise 2-3 sentence summary of the main points from this video transcript: {transcript_text}"""
-        elif summary_type == "chapter":
-            prompt = f"""Break this video transcript into logical chapters/sections with timestamps and brief descriptions: {transcript_text}"""
-        else:
-            prompt = prompt_template + transcript_text
-            
-        response = model.generate_content(prompt)
-        return response.text
-    except Exception as e:
-        st.error(f"Error generating summary: {str(e)}")
-        return None
+@st.cache_resource
+def _get_model(name):
+    return _get_genai().GenerativeModel(name)
+
+DETAILED_PROMPT_TEMPLATE = """Provide a comprehensive summary of this video transcript, including:
+1. Main topics and key points
+2. Important details and examples
+3. Key takeaways
+Please format the summary in clear paragraphs with proper headings:\n\n"""
+
+_MAP_PROMPT = """Summarize the key points, details and examples in this section of a video transcript as concise notes:\n\n"""
+
+@st.cache_resource
+def _event_loop():
+    # One long-lived loop keeps the async Gemini clients bound to the same loop across reruns
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop
+
+def _run_async(coro):
+    return asyncio.run_coroutine_threadsafe(coro, _event_loop()).result()
+
+def _chunk_transcript(transcript_text, max_tokens=6000):
+    # Roughly 4 characters per token; split on word boundaries
+    max_chars = max_tokens * 4
+    chunks, current, length = [], [], 0
+    for word in transcript_text.split():
+        if current and length + len(word) + 1 > max_chars:
+            chunks.append(" ".join(current))
+            current, length = [], 0
+        current.append(word)
+        length += len(word) + 1
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+_GEMINI_MAX_CONCURRENCY = 10
+
+@st.cache_resource
+def _gemini_limiter():
+    # One semaphore for every async Gemini call across sessions and batch runs; it is
+    # only ever awaited on the shared _event_loop
+    return asyncio.Semaphore(_GEMINI_MAX_CONCURRENCY)
+
+async def _generate_async(model, prompt, retries=4):
+    from google.api_core.exceptions import ResourceExhausted
+
+    for attempt in range(retries + 1):
+        try:
+            async with _gemini_limiter():
+                response = await model.generate_content_async(prompt)
+            return response.text
+        except ResourceExhausted:
+            if attempt == retries:
+                raise
+            # Back off outside the limiter so other calls can use the slot meanwhile
+            await asyncio.sleep(2 ** attempt + random.random())
+
+async def _summarize_chunks(model, chunks):
+    return await asyncio.gather(*(_generate_async(model, _MAP_PROMPT + chunk) for chunk in chunks))
+
+class _SummaryCache:
+    """Nearest-neighbour cache of summaries keyed by transcript embeddings, persisted to disk."""
+
+    def __init__(self, path='.summary_cache', threshold=0.97, max_length_ratio=0.1):
+        from sentence_transformers import SentenceTransformer
+        import faiss
+
+        self._faiss = faiss
+        self._model = SentenceTransformer('all-MiniLM-L6-v2')
+        self._index_path = os.path.join(path, 'index.faiss')
+        self._entries_path = os.path.join(path, 'entries.json')
+        self._threshold = threshold
+        self._max_length_ratio = max_length_ratio
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+
+        self._index, self._entries = self._load()
+
+    def _load(self):
+        if os.path.exists(self._index_path) and os.path.exists(self._entries_path):
+            try:
+                index = self._faiss.read_index(self._index_path)
+                with open(self._entries_path, encoding='utf-8') as f:
+                    entries = json.load(f)
+                # Index rows and entries must line up, otherwise lookups would index past the entries
+                if len(entries) == index.ntotal:
+                    return index, entries
+            except (RuntimeError, ValueError):
+                pass
+            logger.warning("Summary cache at %s is inconsistent, rebuilding it", self._index_path)
+        return self._faiss.IndexFlatIP(self._model.get_sentence_embedding_dimension()), []
+
+    def _replace(self, path, write):
+        # Write to a per-process temp file, then swap it in atomically
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        write(tmp_path)
+        os.replace(tmp_path, path)
+
+    # The public methods never raise: a cache failure must not fail the summary itself
+
+    def embed(self, transcript_text, window=200):
+        try:
+            # The model truncates long inputs, so average the embeddings of fixed-size word windows
+            words = transcript_text.split()
+            windows = [" ".join(words[i:i + window]) for i in range(0, len(words), window)] or [""]
+            emb = self._model.encode(windows, normalize_embeddings=True).mean(axis=0, keepdims=True)
+            self._faiss.normalize_L2(emb)
+            return emb
+        except Exception:
+            logger.exception("Could not embed transcript for the summary cache")
+            return None
+
+    def lookup(self, emb, summary_type, word_count, k=8):
+        if emb is None:
+            return None
+        try:
+            with self._lock:
+                if not self._index.ntotal:
+                    return None
+                scores, ids = self._index.search(emb, min(k, self._index.ntotal))
+                for score, idx in zip(scores[0], ids[0]):
+                    entry = self._entries[idx]
+                    if score < self._threshold or entry['summary_type'] != summary_type:
+                        continue
+                    # Mean-pooled embeddings of long same-topic transcripts drift together,
+                    # so a near-duplicate must also have about the same length
+                    cached_words = entry.get('words')
+                    if cached_words and abs(cached_words - word_count) <= self._max_length_ratio * max(cached_words, word_count):
+                        return entry['summary']
+                return None
+        except Exception:
+            logger.exception("Summary cache lookup failed")
+            return None
+
+    def add(self, emb, summary_type, summary, word_count):
+        if emb is None:
+            return
+        try:
+            with self._lock:
+                self._index.add(emb)
+                self._entries.append({'summary_type': summary_type, 'summary': summary, 'words': word_count})
+                self._replace(self._index_path, lambda p: self._faiss.write_index(self._index, p))
+                self._replace(self._entries_path, self._write_entries)
+        except Exception:
+            logger.exception("Could not store summary in the summary cache")
+
+    def _write_entries(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f)
+
+@st.cache_resource
+def _summary_cache_loader():
+    # Loading torch and the embedding model takes seconds, so do it off the request path
+    holder = {'cache': None}
+
+    def load():
+        try:
+            holder['cache'] = _SummaryCache()
+        except ImportError:
+            pass  # Optional dependencies not installed
+        except Exception:
+            logger.exception("Semantic summary cache disabled")
+
+    threading.Thread(target=load, daemon=True).start()
+    return holder
+
+def _get_summary_cache():
+    # None until the background load finishes, or if the cache is unavailable
+    return _summary_cache_loader()['cache']
+
+def _build_prompt(transcript_text, prompt_template, summary_type):
+    if summary_type == "quick":
+        return f"""Provide a concise 2-3 sentence summary of the main points from this video transcript: {transcript_text}"""
+    elif summary_type == "chapter":
+        return f"""Break this video transcript into logical chapters/sections with timestamps and brief descriptions: {transcript_text}"""
+    return prompt_template + transcript_text
+
+def _summary_key(transcript_text, prompt_template, summary_type):
+    digest = hashlib.sha256((prompt_template + transcript_text).encode('utf-8')).hexdigest()
+    return ('summary', summary_type, digest)
+
+def _lookup_summary(transcript_text, prompt_template, summary_type):
+    # Exact repeats hit the disk cache; near-duplicates (re-uploads, mirrors, reruns) the semantic cache.
+    # Returns the cached summary (or None), whether it came from a near-duplicate,
+    # and the state _store_summary needs on a miss
+    cache_key = _summary_key(transcript_text, prompt_template, summary_type)
+    cached_summary = _disk_cache().get(cache_key)
+    if cached_summary is not None:
+        return cached_summary, False, None
+
+    cache = _get_summary_cache()
+    word_count = len(transcript_text.split())
+    emb = cache.embed(transcript_text) if cache is not None else None
+    if cache is not None:
+        cached_summary = cache.lookup(emb, summary_type, word_count)
+        if cached_summary is not None:
+            return cached_summary, True, None
+    return None, False, (cache_key, cache, emb, word_count)
+
+def _store_summary(lookup_state, summary_type, summary):
+    cache_key, cache, emb, word_count = lookup_state
+    _disk_cache()[cache_key] = summary
+    if cache is not None:
+        cache.add(emb, summary_type, summary, word_count)
+
+def generate_gemini_content(transcript_text, prompt_template, summary_type="detailed", status=None):
+    # Errors propagate so the caller can discard a partially streamed summary.
+    # status, if given, gets 'near_duplicate' set when an earlier video's summary is reused
+    cached_summary, near_duplicate, lookup_state = _lookup_summary(transcript_text, prompt_template, summary_type)
+    if status is not None:
+        status['near_duplicate'] = near_duplicate
+    if cached_summary is not None:
+        yield cached_summary
+        return
+
+    model = _get_model("gemini-1.5-flash")
+
+    # Long transcripts are summarized section by section in parallel, then combined below
+    transcript_chunks = _chunk_transcript(transcript_text)
+    if len(transcript_chunks) > 1:
+        transcript_text = "\n\n".join(_run_async(_summarize_chunks(model, transcript_chunks)))
+    
+    # Stream the response so the first tokens render while the rest is generated
+    prompt = _build_prompt(transcript_text, prompt_template, summary_type)
+    response = model.generate_content(prompt, stream=True)
+    chunks = []
+    for chunk in response:
+        chunks.append(chunk.text)
+        yield chunk.text
+
+    _store_summary(lookup_state, summary_type, "".join(chunks))
+
+async def generate_gemini_content_async(transcript_text, prompt_template, summary_type="detailed", status=None):
+    # Non-streaming counterpart of generate_gemini_content for batch runs; errors propagate to the caller
+    cached_summary, near_duplicate, lookup_state = await asyncio.to_thread(
+        _lookup_summary, transcript_text, prompt_template, summary_type
+    )
+    if status is not None:
+        status['near_duplicate'] = near_duplicate
+    if cached_summary is not None:
+        return cached_summary
+
+    model = _get_model("gemini-1.5-flash")
+    transcript_chunks = _chunk_transcript(transcript_text)
+    if len(transcript_chunks) > 1:
+        transcript_text = "\n\n".join(await _summarize_chunks(model, transcript_chunks))
+
+    summary = await _generate_async(model, _build_prompt(transcript_text, prompt_template, summary_type))
+
+    await asyncio.to_thread(_store_summary, lookup_state, summary_type, summary)
+    return summary
+
+async def _summarize_videos(videos, prompt_template, summary_type, executor, with_metadata=False):
+    # Blocking fetches run on the caller's executor, whose threads carry the script context
+    # so errors reported with st.error inside them still reach the page. Gemini calls are
+    # bounded by the shared limiter in _generate_async, fetches by the executor's workers
+    loop = asyncio.get_running_loop()
+
+    async def process(url, video_id):
+        metadata_future = None
+        if with_metadata and video_id:
+            metadata_future = loop.run_in_executor(executor, extract_video_metadata, video_id)
+        transcript_text, _, _ = await loop.run_in_executor(executor, extract_transcript_details, url)
+        metadata = await metadata_future if metadata_future is not None else None
+        if not transcript_text:
+            return None, metadata, False
+        status = {}
+        summary = await generate_gemini_content_async(transcript_text, prompt_template, summary_type, status)
+        return summary, metadata, status['near_duplicate']
+
+    return await asyncio.gather(*(process(url, video_id) for url, video_id in videos), return_exceptions=True)
+
+@st.cache_resource
+def _summaries_db():
+    # Shared by every session, so writes are serialized through the lock
+    conn = sqlite3.connect('summaries.db', check_same_thread=False)
+    conn.execute('CREATE TABLE IF NOT EXISTS summaries(ts TEXT, video_id TEXT PRIMARY KEY, title TEXT, summary TEXT)')
+    # One-time import of the history saved by earlier versions; later rows for a video win
+    legacy_file = 'summaries_history.csv'
+    if os.path.exists(legacy_file) and not conn.execute('SELECT 1 FROM summaries LIMIT 1').fetchone():
+        with open(legacy_file, newline='', encoding='utf-8') as f:
+            conn.executemany(
+                'INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?)',
+                ((row['timestamp'], row['video_id'], row['title'], row['summary']) for row in csv.DictReader(f))
+            )
+    conn.commit()
+    return conn, threading.Lock()
 
 def save_summary(summary, video_id, metadata):
     try:
-        df = pd.DataFrame({
-            'timestamp': [datetime.now()],
-            'video_id': [video_id],
-            'title': [metadata.get('title', 'Unknown')],
-            'summary': [summary]
-        })
-        
-        filename = 'summaries_history.csv'
-        if os.path.exists(filename):
-            df.to_csv(filename, mode='a', header=False, index=False)
-        else:
-            df.to_csv(filename, index=False)
+        conn, lock = _summaries_db()
+        with lock:
+            conn.execute(
+                'INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?)',
+                (datetime.now().isoformat(sep=' '), video_id, metadata.get('title', 'Unknown'), summary)
+            )
+            conn.commit()
         return True
     except Exception as e:
         st.error(f"Error saving summary: {str(e)}")
         return False
 
+_NEAR_DUPLICATE_NOTE = "♻️ Reused from a previously summarized video with a near-identical transcript."
+
+def render_video_details(metadata):
+    st.markdown("### Video Details")
+    st.write(f"📺 **Title:** {metadata['title']}")
+    st.write(f"👤 **Channel:** {metadata['channel']}")
+    if metadata['duration'] is not None:
+        st.write(f"⏱️ **Duration:** {metadata['duration'] // 60}:{metadata['duration'] % 60:02d} minutes")
+    else:
+        st.write("⏱️ **Duration:** —")
+    if metadata['views'] is not None:
+        st.write(f"👁️ **Views:** {metadata['views']:,}")
+    else:
+        st.write("👁️ **Views:** —")
+
 # Streamlit UI
 st.title("📝 YouTube Transcript to Detailed Notes Converter")
 st.markdown("Transform any YouTube video into comprehensive notes with AI-powered summarization.")
@@ -115,53 +479,78 @@ st.markdown("Transform any YouTube video into comprehensive notes with AI-powere
 with st.sidebar:
     st.header("⚙️ Settings")
     summary_type = st.selectbox("Summary Type", ["detailed", "quick", "chapter"])
-    save_to_file = st.checkbox("Save Summary to File", value=False)
+    save_to_file = st.checkbox("Save Summary to History", value=False)
+    full_stats = st.checkbox("Show Full Video Stats", value=False, help="Also fetch duration and views (slower)")
 
 # Main content
 youtube_link = st.text_input("🔗 Enter YouTube Video Link:", placeholder="https://www.youtube.com/watch?v=...")
 
-if youtube_link:
-    video_id = extract_video_id(youtube_link)
-    if video_id:
-        col1, col2 = st.columns([2, 1])
-        
-        with col1:
-            st.image(f"http://img.youtube.com/vi/{video_id}/0.jpg", use_container_width=True)
-        
-        with col2:
-            metadata = extract_video_metadata(video_id)
-            if metadata:
-                st.markdown("### Video Details")
-                st.write(f"📺 **Title:** {metadata['title']}")
-                st.write(f"👤 **Channel:** {metadata['channel']}")
-                st.write(f"⏱️ **Duration:** {metadata['duration'] // 60}:{metadata['duration'] % 60:02d} minutes")
-                st.write(f"👁️ **Views:** {metadata['views']:,}")
-
-if st.button("🚀 Generate Summary"):
+# Only re-parse the link and reset the video card when the URL actually changes,
+# so reruns from unrelated widgets don't re-enter the cached helpers
+if st.session_state.get('_url') != youtube_link:
+    st.session_state['_url'] = youtube_link
+    st.session_state['_vid'] = extract_video_id(youtube_link) if youtube_link else None
+    st.session_state['_meta'] = None
+    st.session_state['_meta_full'] = None
+
+video_id = st.session_state['_vid']
+details_slot = None
+
+if video_id:
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        st.image(f"http://img.youtube.com/vi/{video_id}/0.jpg", use_container_width=True)
+
+    with col2:
+        # Filled in once metadata has been fetched alongside the transcript
+        details_slot = st.empty()
+        if st.session_state['_meta']:
+            with details_slot.container():
+                render_video_details(st.session_state['_meta'])
+
+if st.button("🚀 Generate Summary") and video_id:
     with st.spinner("🔄 Processing... This may take a few moments."):
-        transcript_text, formatted_transcript = extract_transcript_details(youtube_link)
-        
+        # Metadata and transcript are independent network calls, so fetch them in parallel
+        ctx = get_script_run_ctx()
+        need_metadata = not st.session_state['_meta'] or st.session_state['_meta_full'] != full_stats
+        with ThreadPoolExecutor(max_workers=2, initializer=add_script_run_ctx, initargs=(None, ctx)) as executor:
+            if need_metadata:
+                metadata_future = executor.submit(extract_video_metadata, video_id, full_stats)
+            transcript_future = executor.submit(extract_transcript_details, youtube_link)
+            if need_metadata:
+                st.session_state['_meta'] = metadata_future.result()
+                st.session_state['_meta_full'] = full_stats
+            transcript_text, transcript_df, transcript_download = transcript_future.result()
+
+        metadata = st.session_state['_meta']
+        if metadata and need_metadata:
+            with details_slot.container():
+                render_video_details(metadata)
+
         if transcript_text:
             # Show transcript in expander
             with st.expander("📜 View Original Transcript"):
-                transcript_df = pd.DataFrame(formatted_transcript)
                 st.dataframe(transcript_df, use_container_width=True)
             
             # Generate and display summary
-            summary = generate_gemini_content(
-                transcript_text,
-                prompt_template="""Provide a comprehensive summary of this video transcript, including:
-                1. Main topics and key points
-                2. Important details and examples
-                3. Key takeaways
-                Please format the summary in clear paragraphs with proper headings:\n\n""",
-                summary_type=summary_type
-            )
+            st.markdown("### 📋 Summary")
+            summary_status = {}
+            try:
+                summary = st.write_stream(generate_gemini_content(
+                    transcript_text,
+                    prompt_template=DETAILED_PROMPT_TEMPLATE,
+                    summary_type=summary_type,
+                    status=summary_status
+                ))
+            except Exception as e:
+                # A stream that fails partway leaves a truncated summary; don't save or offer it
+                st.error(f"Error generating summary: {str(e)}")
+                summary = None
             
             if summary:
-                st.markdown("### 📋 Summary")
-                st.write(summary)
-                
+                if summary_status.get('near_duplicate'):
+                    st.caption(_NEAR_DUPLICATE_NOTE)
                 if save_to_file and metadata:
                     if save_summary(summary, video_id, metadata):
                         st.success("✅ Summary saved successfully!")
@@ -176,15 +565,46 @@ if st.button("🚀 Generate Summary"):
                         mime="text/plain"
                     )
                 with col2:
-                    if formatted_transcript:
-                        transcript_text = "\n".join([f"{item['timestamp']}: {item['text']}" for item in formatted_transcript])
+                    if transcript_download:
                         st.download_button(
                             "📥 Download Transcript",
-                            transcript_text,
+                            transcript_download,
                             file_name=f"transcript_{video_id}.txt",
                             mime="text/plain"
                         )
 
+# Batch mode: summarize several videos concurrently
+st.markdown("---")
+st.markdown("### 📚 Batch Summarize Multiple Videos")
+batch_links = st.text_area("🔗 Enter one YouTube link per line:", placeholder="https://www.youtube.com/watch?v=...")
+
+if st.button("🚀 Generate Summaries"):
+    urls = list(dict.fromkeys(line.strip() for line in batch_links.splitlines() if line.strip()))
+    if urls:
+        videos = [(url, extract_video_id(url)) for url in urls]
+        with st.spinner(f"🔄 Processing {len(urls)} videos..."):
+            ctx = get_script_run_ctx()
+            with ThreadPoolExecutor(max_workers=8, initializer=add_script_run_ctx, initargs=(None, ctx)) as executor:
+                results = _run_async(_summarize_videos(
+                    videos, DETAILED_PROMPT_TEMPLATE, summary_type, executor, with_metadata=save_to_file
+                ))
+
+        for (url, batch_video_id), result in zip(videos, results):
+            with st.expander(f"📋 {batch_video_id or url}", expanded=True):
+                if isinstance(result, Exception):
+                    st.error(f"Error generating summary: {str(result)}")
+                    continue
+                batch_summary, batch_metadata, batch_near_duplicate = result
+                if not batch_summary:
+                    st.warning("Could not extract a transcript for this video.")
+                    continue
+                st.markdown(batch_summary)
+                if batch_near_duplicate:
+                    st.caption(_NEAR_DUPLICATE_NOTE)
+                if save_to_file and batch_metadata:
+                    if save_summary(batch_summary, batch_video_id, batch_metadata):
+                        st.success("✅ Summary saved successfully!")
+
 # Footer
 st.markdown("---")
 st.markdown("""